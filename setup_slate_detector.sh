@@ -55,14 +55,18 @@ echo "Installing Python dependencies..."
 python3 -m pip install --upgrade pip
 python3 -m pip install \
     opencv-python \
+    av \
     numpy \
+    numba \
     tqdm \
     Pillow
 
 # Create requirements.txt
 cat > requirements.txt << EOF
 opencv-python>=4.8.0
+av>=14.0.0
 numpy>=1.24.0
+numba>=0.57.0
 tqdm>=4.65.0
 Pillow>=9.5.0
 EOF
@@ -9,12 +9,17 @@ import os
 import sys
 import json
 import argparse
+import av
+from av.codec.hwaccel import HWAccel, hwdevices_available
 import cv2
 import numpy as np
+from numba import njit
 from pathlib import Path
 from datetime import datetime
 import hashlib
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 import logging
 
@@ -32,8 +37,243 @@ VIDEO_EXTENSIONS = {
     '.f4v', '.ogv', '.vob', '.ts', '.m2ts', '.mts'
 }
 
+# Files smaller than this cannot hold a decodable video and are skipped
+MIN_VIDEO_SIZE = 1024
+
+# Resolution frames are downsampled to for edge detection. The black/white
+# ratios are still measured at full resolution, where the fixed thresholds
+# hold: area averaging blends thin text strokes into the background.
+ANALYSIS_WIDTH = 320
+ANALYSIS_HEIGHT = 180
+
+# Frames analyzed together in the fallback scan, and batches buffered ahead
+ANALYSIS_BATCH_SIZE = 8
+DECODE_QUEUE_SIZE = 4
+
+# PNG compression level for saved slates (0-9); low levels encode much faster
+PNG_COMPRESSION = 3
+
+# Per-worker scratch buffers, reused across frames instead of reallocated
+_scratch = threading.local()
+
+def _scratch_buffers(shape):
+    """
+    Return this worker's (gray, small, edges) analysis buffers.
+    
+    The full-resolution gray buffer is reallocated only when the frame size
+    changes; the downsampled buffers are allocated once.
+    
+    Args:
+        shape: (height, width) of the frames being analyzed
+        
+    Returns:
+        tuple: (gray, small, edges) uint8 arrays
+    """
+    if not hasattr(_scratch, 'small'):
+        _scratch.small = np.empty((ANALYSIS_HEIGHT, ANALYSIS_WIDTH), dtype=np.uint8)
+        _scratch.edges = np.empty_like(_scratch.small)
+    gray = getattr(_scratch, 'gray', None)
+    if gray is None or gray.shape != shape:
+        gray = _scratch.gray = np.empty(shape, dtype=np.uint8)
+    return gray, _scratch.small, _scratch.edges
+
+# Frame resolution varies between videos, so the kernel is specialized on
+# dtype and memory layout instead: both variants are compiled eagerly at
+# import, before any worker thread would stall on a first-call JIT compile
+@njit(['UniTuple(int64, 2)(uint8[:, ::1])', 'UniTuple(int64, 2)(uint8[:, :])'],
+      cache=True, fastmath=True, nogil=True)
+def _slate_stats(gray):
+    """
+    Count dark (<30) and bright (>200) pixels of a grayscale frame in a single pass.
+    
+    Loops over the frame's own shape, so any resolution is accepted; inputs
+    other than 2D uint8 arrays raise TypeError instead of compiling a new variant.
+    """
+    black = 0
+    white = 0
+    for i in range(gray.shape[0]):
+        for j in range(gray.shape[1]):
+            v = gray[i, j]
+            if v < 30:
+                black += 1
+            elif v > 200:
+                white += 1
+    return black, white
+
+# Hardware decoder device types found unusable during this run
+_hwaccel_unavailable = set()
+_hwaccel_lock = threading.Lock()
+
+def _open_video(video_path, hwaccel=None):
+    """
+    Open a video container for decoding.
+    
+    If the container cannot be opened with hardware acceleration but opens
+    for CPU decoding, the device is assumed unusable: a single warning is
+    logged and later videos are opened for CPU decoding straight away.
+    
+    Args:
+        video_path: Path to the video file
+        hwaccel: Hardware decoder device type (e.g. 'cuda', 'vaapi'), or None
+        
+    Returns:
+        av container, decoding on the GPU when the device is available
+    """
+    hwaccel_error = None
+    if hwaccel and hwaccel not in _hwaccel_unavailable:
+        try:
+            return av.open(str(video_path), hwaccel=HWAccel(device_type=hwaccel))
+        except av.error.FFmpegError as e:
+            hwaccel_error = e
+    
+    container = av.open(str(video_path))
+    if hwaccel_error is not None:
+        with _hwaccel_lock:
+            if hwaccel not in _hwaccel_unavailable:
+                _hwaccel_unavailable.add(hwaccel)
+                logger.warning(f"Hardware decoding ({hwaccel}) unavailable, "
+                               f"falling back to CPU decoding: {hwaccel_error}")
+    return container
+
+def _grab_frame(container, frame_idx):
+    """
+    Decode a single frame by seeking to the nearest preceding keyframe.
+    
+    Only the GOP containing the requested frame is demuxed and decoded,
+    instead of every frame from the start of the file.
+    
+    Args:
+        container: Open av container of the video
+        frame_idx: Index of the frame to extract
+        
+    Returns:
+        numpy array: BGR frame, or None if it could not be decoded
+    """
+    stream = container.streams.video[0]
+    fps = stream.average_rate or 30
+    start_pts = stream.start_time or 0
+    
+    # Container-level seek is expressed in AV_TIME_BASE units
+    offset = (container.start_time or 0) + int(frame_idx / fps * av.time_base)
+    
+    # Timestamp seeks are approximate in some formats (e.g. MPEG-TS); if the
+    # seek lands past the target (or past the last packet, so nothing
+    # decodes), decode forward from the beginning instead
+    for seek_offset in (offset, 0):
+        container.seek(seek_offset, backward=True, any_frame=False)
+        
+        # Decode forward from the keyframe until the target frame is reached
+        first_frame = True
+        for frame in container.decode(stream):
+            if frame.pts is None:
+                continue
+            position = (frame.pts - start_pts) * stream.time_base * fps
+            if first_frame and position > frame_idx and seek_offset:
+                break
+            first_frame = False
+            if position >= frame_idx:
+                return frame.to_ndarray(format='bgr24')
+        
+        if not first_frame:
+            # Decoding started before the target but the stream ended first
+            return None
+    
+    return None
+
+def _read_frames(container, count):
+    """
+    Sequentially decode the first frames of a video as grayscale.
+    
+    The grayscale conversion happens in libswscale as part of the decode,
+    so only the luma plane reaches Python.
+    
+    Args:
+        container: Open av container of the video
+        count: Maximum number of frames to decode
+        
+    Yields:
+        numpy array: Grayscale frame
+    """
+    # Rewind, since an earlier frame grab may have moved the read position.
+    # Seeking to 0 rather than the start time lands on the first keyframe even
+    # in formats like MPEG-TS, where timestamp seeks are approximate
+    container.seek(0, backward=True, any_frame=False)
+    
+    for frame_num, frame in enumerate(container.decode(video=0)):
+        if frame_num >= count:
+            break
+        yield frame.to_ndarray(format='gray')
+
+def _decode_batches(container, count):
+    """
+    Decode and measure frames on a background thread, in batches.
+    
+    Decoding runs ahead of the caller through a bounded queue, so the
+    next batch is decoded while the current one is being analyzed.
+    
+    Args:
+        container: Open av container of the video
+        count: Maximum number of frames to decode
+        
+    Yields:
+        tuple: (first_frame_number, frames, black_ratios, white_ratios) with
+        frames an (N, H, W) uint8 array of downsampled grayscale frames and
+        the ratios measured on the full-resolution frames
+    """
+    frames = np.empty((count, ANALYSIS_HEIGHT, ANALYSIS_WIDTH), dtype=np.uint8)
+    black_ratios = np.empty(count)
+    white_ratios = np.empty(count)
+    batches = queue.Queue(maxsize=DECODE_QUEUE_SIZE)
+    stop = threading.Event()
+    end_of_stream = object()
+    
+    def batch(start, end):
+        return start, frames[start:end], black_ratios[start:end], white_ratios[start:end]
+    
+    def produce():
+        try:
+            start = decoded = 0
+            for gray in _read_frames(container, count):
+                if stop.is_set():
+                    return
+                black_pixels, white_pixels = _slate_stats(gray)
+                black_ratios[decoded] = black_pixels / gray.size
+                white_ratios[decoded] = white_pixels / gray.size
+                cv2.resize(gray, (ANALYSIS_WIDTH, ANALYSIS_HEIGHT), dst=frames[decoded],
+                           interpolation=cv2.INTER_AREA)
+                decoded += 1
+                if decoded - start == ANALYSIS_BATCH_SIZE:
+                    batches.put(batch(start, decoded))
+                    start = decoded
+            if decoded > start:
+                batches.put(batch(start, decoded))
+        except Exception as e:
+            batches.put(e)
+        finally:
+            batches.put(end_of_stream)
+    
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = batches.get()
+            if item is end_of_stream:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Unblock the producer if the caller stopped early
+        stop.set()
+        while producer.is_alive():
+            try:
+                batches.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        producer.join()
+
 class SlateDetector:
-    def __init__(self, input_folder, output_folder, frames_to_check=60, threshold=0.8, target_frame=20, once_per_folder=False):
+    def __init__(self, input_folder, output_folder, frames_to_check=60, threshold=0.8, target_frame=20, once_per_folder=False, hwaccel=None):
         """
         Initialize the slate detector.
         
@@ -44,6 +284,7 @@ class SlateDetector:
             threshold: Confidence threshold for slate detection (0-1)
             target_frame: Specific frame to check first (default: 20)
             once_per_folder: Only save first slate per subfolder (default: False)
+            hwaccel: Hardware decoder device type, e.g. 'cuda' or 'vaapi' (default: None)
         """
         self.input_folder = Path(input_folder).resolve()
         self.output_folder = Path(output_folder).resolve()
@@ -51,21 +292,41 @@ class SlateDetector:
         self.threshold = threshold
         self.target_frame = target_frame
         self.once_per_folder = once_per_folder
+        self.hwaccel = hwaccel
         self.metadata = {}
         self.saved_folders = set()  # Track folders that already have a slate saved
+        self.saved_folders_lock = threading.Lock()  # Workers share saved_folders
+        self.png_pool = None  # Background PNG writer while processing in parallel
+        self.results_path = self.output_folder / 'slate_metadata.jsonl'  # Per-video results, one per line
         
         # Create output folder if it doesn't exist
         self.output_folder.mkdir(parents=True, exist_ok=True)
         
     def find_video_files(self):
         """Recursively find all video files in the input folder."""
+        extensions = {ext.lower() for ext in VIDEO_EXTENSIONS}
         video_files = []
         
-        for ext in VIDEO_EXTENSIONS:
-            video_files.extend(self.input_folder.rglob(f'*{ext}'))
-            video_files.extend(self.input_folder.rglob(f'*{ext.upper()}'))
+        # Walk the tree once, matching extensions case-insensitively
+        for root, _, files in os.walk(self.input_folder,
+                                      onerror=lambda e: logger.warning(f"Cannot scan directory: {e}")):
+            for name in files:
+                dot = name.rfind('.')
+                if dot < 0 or name[dot:].lower() not in extensions:
+                    continue
+                
+                path = os.path.join(root, name)
+                try:
+                    size = os.stat(path).st_size
+                except OSError as e:
+                    logger.warning(f"Cannot read {path}: {e}")
+                    continue
+                if size < MIN_VIDEO_SIZE:
+                    logger.debug(f"Skipping {path}: too small to be a video")
+                    continue
+                video_files.append(Path(path))
         
-        return sorted(set(video_files))
+        return sorted(video_files)
     
     def is_slate_frame(self, frame):
         """
@@ -81,55 +342,96 @@ class SlateDetector:
             return False, 0.0
         
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray, small, edges = _scratch_buffers(frame.shape[:2])
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
         
-        # Calculate histogram
-        hist = cv2.calcHist([gray], [0], None, [256], [0, 256])
+        black_pixels, white_pixels = _slate_stats(gray)
         
-        # Normalize histogram
-        hist = hist.flatten() / hist.sum()
-        
-        # Check if image is mostly black (high concentration of dark pixels)
-        black_pixels_ratio = hist[:30].sum()  # Pixels with values 0-30
-        
-        # Apply threshold to get binary image
-        _, binary = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)
-        
-        # Calculate white pixels ratio (potential text)
-        white_pixels_ratio = np.sum(binary == 255) / binary.size
+        return self._score_slate(gray, black_pixels / gray.size, white_pixels / gray.size)
+    
+    def _score_slate(self, gray, black_pixels_ratio, white_pixels_ratio):
+        """
+        Score a grayscale frame from its full-resolution black and white pixel ratios.
         
+        Args:
+            gray: Grayscale frame, at full or analysis resolution
+            black_pixels_ratio: Ratio of pixels with values 0-29
+            white_pixels_ratio: Ratio of pixels with values above 200
+            
+        Returns:
+            tuple: (is_slate, confidence_score)
+        """
         # Detect if it's a slate (more lenient criteria):
         # - Most pixels should be black (>50%)
         # - Some white pixels for text (0.5-40%)
         # - High contrast between black and white areas
-        is_slate = (
-            black_pixels_ratio > 0.5 and
-            0.005 < white_pixels_ratio < 0.4
+        # Canny only runs once both ratios pass.
+        
+        # Check if image is mostly black (high concentration of dark pixels)
+        if black_pixels_ratio <= 0.5:
+            return False, 0.0
+        
+        # Check white pixels ratio (potential text)
+        if not 0.005 < white_pixels_ratio < 0.4:
+            return False, 0.0
+        
+        # Check for text-like patterns using edge detection, on a
+        # downsampled frame since Canny dominates the cost here
+        _, small, edges = _scratch_buffers(gray.shape)
+        if gray.shape != small.shape:
+            cv2.resize(gray, (ANALYSIS_WIDTH, ANALYSIS_HEIGHT), dst=small, interpolation=cv2.INTER_AREA)
+            gray = small
+        cv2.Canny(gray, 50, 150, edges=edges)
+        edge_ratio = np.count_nonzero(edges) / edges.size
+        
+        # Confidence based on expected characteristics
+        confidence = min(
+            black_pixels_ratio * 0.4 +  # Black background weight
+            (1 - abs(white_pixels_ratio - 0.1) * 5) * 0.4 +  # Optimal text coverage
+            edge_ratio * 0.2  # Edge presence
+        , 1.0)
+        
+        return True, confidence
+    
+    def _best_slate_in_batch(self, frames, black_ratios, white_ratios):
+        """
+        Find the most confident slate in a batch of downsampled frames.
+        
+        Candidates are selected for the whole batch at once; only the
+        frames that pass both ratio checks are scored with Canny.
+        
+        Args:
+            frames: (N, H, W) uint8 array of downsampled grayscale frames
+            black_ratios: Full-resolution ratio of pixels with values 0-29, per frame
+            white_ratios: Full-resolution ratio of pixels with values above 200, per frame
+            
+        Returns:
+            tuple: (confidence, index), or (0.0, -1) if no slate was found
+        """
+        candidates = np.flatnonzero(
+            (black_ratios > 0.5) & (white_ratios > 0.005) & (white_ratios < 0.4)
         )
         
-        # Calculate confidence score
-        if is_slate:
-            # Check for text-like patterns using edge detection
-            edges = cv2.Canny(gray, 50, 150)
-            edge_ratio = np.sum(edges > 0) / edges.size
+        best_confidence = 0.0
+        best_index = -1
+        for index in candidates:
+            is_slate, confidence = self._score_slate(
+                frames[index], black_ratios[index], white_ratios[index]
+            )
             
-            # Confidence based on expected characteristics
-            confidence = min(
-                black_pixels_ratio * 0.4 +  # Black background weight
-                (1 - abs(white_pixels_ratio - 0.1) * 5) * 0.4 +  # Optimal text coverage
-                edge_ratio * 0.2  # Edge presence
-            , 1.0)
-        else:
-            confidence = 0.0
-        
-        return is_slate, confidence
-    
-    def process_video(self, video_path):
+            if is_slate and confidence > best_confidence:
+                best_confidence = confidence
+                best_index = int(index)
+        
+        return best_confidence, best_index
+    
+    def process_video(self, video_path, decoder_threads=0):
         """
         Process a single video file to detect slates.
         
         Args:
             video_path: Path to the video file
+            decoder_threads: FFmpeg decoder threads for this video (0 = auto)
             
         Returns:
             dict: Processing result with slate information
@@ -143,56 +445,64 @@ class SlateDetector:
             'error': None
         }
         
+        container = None
         try:
-            # Open video file
-            cap = cv2.VideoCapture(str(video_path))
-            
-            if not cap.isOpened():
+            # Open the video once; every frame grab below reuses the container
+            try:
+                container = _open_video(video_path, self.hwaccel)
+            except av.error.FFmpegError:
                 result['error'] = 'Failed to open video file'
                 return result
             
-            # Get video properties
-            fps = cap.get(cv2.CAP_PROP_FPS) or 30  # Default to 30 fps if not available
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            if not container.streams.video:
+                result['error'] = 'No video stream found'
+                return result
+            
+            # Get video properties from the container headers (no seeking)
+            stream = container.streams.video[0]
+            stream.codec_context.thread_count = decoder_threads
+            fps = float(stream.average_rate or 30)  # Default to 30 fps if not available
+            total_frames = stream.frames
+            if not total_frames and container.duration:
+                # Some containers (e.g. MKV) don't store a frame count
+                total_frames = int(container.duration / av.time_base * fps)
             
             # Calculate target frame (default: frame 20 at ~0.8 seconds for 25fps)
             # This avoids fade-ins and catches the slate before the 1s black transition
             target_frame = min(self.target_frame, total_frames - 1)
             
-            best_slate_frame = None
+            best_slate_png = None
             best_confidence = 0.0
             best_frame_number = -1
             
-            # First, try to check the target frame (frame 20)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
-            ret, frame = cap.read()
-            if ret:
+            # First, try to check the target frame (frame 20) with a keyframe seek
+            frame = _grab_frame(container, target_frame)
+            if frame is not None:
                 is_slate, confidence = self.is_slate_frame(frame)
                 if is_slate and confidence >= self.threshold:
-                    # Found a good slate at the target frame
-                    best_slate_frame = frame.copy()
+                    # Found a good slate at the target frame; keep it PNG-encoded
+                    # rather than holding on to the full-resolution frame
+                    best_slate_png = self._encode_png(frame)
                     best_confidence = confidence
                     best_frame_number = target_frame
                     logger.debug(f"Found slate at target frame {target_frame} with confidence {confidence:.3f}")
             
-            # If no good slate at target frame, check other frames
+            # If no good slate at target frame, check other frames from the beginning
             if best_confidence < self.threshold:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # Reset to beginning
-                frames_to_check = min(self.frames_to_check, int(fps * 2), total_frames)
+                frames_to_check = max(min(self.frames_to_check, int(fps * 2), total_frames), 0)
                 
-                for frame_num in range(frames_to_check):
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-                    
-                    is_slate, confidence = self.is_slate_frame(frame)
+                # Batches are decoded in the background while earlier ones are analyzed
+                for first_frame, frames, black_ratios, white_ratios in _decode_batches(
+                        container, frames_to_check):
+                    confidence, index = self._best_slate_in_batch(frames, black_ratios, white_ratios)
                     
-                    if is_slate and confidence > best_confidence:
-                        best_slate_frame = frame.copy()
+                    if confidence > best_confidence:
                         best_confidence = confidence
-                        best_frame_number = frame_num
-            
-            cap.release()
+                        best_frame_number = first_frame + index
+                    
+                    # Stop decoding once the slate is clearly above the threshold
+                    if best_confidence >= self.threshold + 0.05:
+                        break
             
             # Log diagnostic info for debugging
             if best_confidence > 0:
@@ -212,20 +522,39 @@ class SlateDetector:
                 
                 if self.once_per_folder:
                     # Check if we've already saved a slate from this folder
-                    if video_folder in self.saved_folders:
-                        should_save = False
+                    with self.saved_folders_lock:
+                        if video_folder in self.saved_folders:
+                            should_save = False
+                        else:
+                            self.saved_folders.add(video_folder)
+                    if not should_save:
                         logger.info(f"Slate found in {relative_path} but skipping save (already have slate from this folder)")
-                    else:
-                        self.saved_folders.add(video_folder)
                 
                 if should_save:
                     # Generate unique filename
-                    video_hash = hashlib.md5(str(video_path).encode()).hexdigest()[:8]
+                    video_hash = hashlib.blake2b(str(video_path).encode(), digest_size=4).hexdigest()
                     png_filename = f"slate_{video_hash}_{best_frame_number:04d}.png"
                     png_path = self.output_folder / png_filename
                     
-                    # Save the slate frame
-                    cv2.imwrite(str(png_path), best_slate_frame)
+                    # The fallback scan only keeps downsampled frames, so decode
+                    # the full-resolution slate again
+                    if best_slate_png is None:
+                        frame = _grab_frame(container, best_frame_number)
+                        if frame is not None:
+                            best_slate_png = self._encode_png(frame)
+                    
+                    if best_slate_png is None:
+                        result['png_filename'] = None
+                        result['error'] = f'Failed to decode slate frame {best_frame_number}'
+                        logger.error(f"Slate found in {relative_path} at frame {best_frame_number} "
+                                     f"but the frame could not be decoded for saving")
+                        return result
+                    
+                    # Save the slate image, in the background when running in parallel
+                    if self.png_pool is not None:
+                        self.png_pool.submit(self._write_png, png_path, best_slate_png)
+                    else:
+                        self._write_png(png_path, best_slate_png)
                     result['png_filename'] = png_filename
                     
                     logger.info(f"Slate found and saved in {relative_path} at frame {best_frame_number} "
@@ -236,59 +565,125 @@ class SlateDetector:
         except Exception as e:
             result['error'] = str(e)
             logger.error(f"Error processing {relative_path}: {e}")
+        finally:
+            if container is not None:
+                container.close()
         
         return result
     
+    def _encode_png(self, frame):
+        """Encode a slate frame as a PNG buffer."""
+        ok, png = cv2.imencode('.png', frame, [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION])
+        if not ok:
+            raise ValueError('Failed to encode slate frame as PNG')
+        return png
+    
+    def _write_png(self, png_path, png):
+        """Write an encoded slate PNG to disk."""
+        try:
+            png_path.write_bytes(png.tobytes())
+        except OSError as e:
+            logger.error(f"Failed to write {png_path}: {e}")
+    
     def process_videos_parallel(self, video_files, max_workers=None):
         """
         Process multiple videos in parallel.
         
+        Every result is streamed to the JSON Lines results file as it
+        completes; only results with a slate are kept in memory.
+        
         Args:
             video_files: List of video file paths
             max_workers: Maximum number of parallel workers
+            
+        Returns:
+            list: Results of the videos where a slate was found
         """
         results = []
+        workers = max_workers or os.cpu_count() or 1
+        decoder_threads = 0
+        opencv_threads = cv2.getNumThreads()
         
-        # Use ProcessPoolExecutor for CPU-bound tasks
-        with ProcessPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_video = {
-                executor.submit(self.process_video, video): video 
-                for video in video_files
-            }
-            
-            # Process completed tasks with progress bar
-            with tqdm(total=len(video_files), desc="Processing videos") as pbar:
-                for future in as_completed(future_to_video):
-                    video = future_to_video[future]
-                    try:
-                        result = future.result()
-                        results.append(result)
-                    except Exception as e:
-                        logger.error(f"Failed to process {video}: {e}")
-                        results.append({
-                            'video_path': str(video.relative_to(self.input_folder)),
-                            'slate_found': False,
-                            'error': str(e)
-                        })
-                    pbar.update(1)
+        # The pool never runs more videos at once than there are videos
+        if min(workers, len(video_files)) > 1:
+            # Stop OpenCV and FFmpeg from each spawning a thread per core on
+            # top of the pool, which would oversubscribe the CPU. OpenCV's
+            # setting is process-wide, so it is set once and restored below
+            decoder_threads = 1
+            cv2.setNumThreads(1)
+        
+        # Decoding and frame analysis run in PyAV/OpenCV/Numba code that
+        # releases the GIL, so threads avoid process startup and result pickling.
+        # PNG writes are handed off to a separate pool so workers can move on to
+        # the next video; leaving the block waits for all pending writes.
+        try:
+            with open(self.results_path, 'w', encoding='utf-8') as results_file, \
+                 ThreadPoolExecutor(max_workers=2) as self.png_pool, \
+                 ThreadPoolExecutor(max_workers=workers) as executor:
+                # Submit all tasks
+                future_to_video = {
+                    executor.submit(self.process_video, video, decoder_threads): video 
+                    for video in video_files
+                }
+                
+                # Process completed tasks with progress bar
+                with tqdm(total=len(video_files), desc="Processing videos") as pbar:
+                    for future in as_completed(future_to_video):
+                        video = future_to_video[future]
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            logger.error(f"Failed to process {video}: {e}")
+                            result = {
+                                'video_path': str(video.relative_to(self.input_folder)),
+                                'slate_found': False,
+                                'error': str(e)
+                            }
+                        
+                        results_file.write(json.dumps(result, ensure_ascii=False) + '\n')
+                        if result['slate_found']:
+                            results.append(result)
+                        pbar.update(1)
+        finally:
+            self.png_pool = None
+            cv2.setNumThreads(opencv_threads)
         
         return results
     
-    def save_metadata(self, results):
-        """Save metadata to JSON file."""
+    def save_metadata(self, results, total_videos):
+        """
+        Save metadata to JSON file.
+        
+        The per-video entries are copied from the JSON Lines results file
+        written by process_videos_parallel, which must have run first.
+        
+        Args:
+            results: Results of the videos where a slate was found
+            total_videos: Number of videos scanned
+            
+        Returns:
+            dict: Summary metadata; it has no 'videos' key, the per-video
+            entries are only written to the file
+        """
         metadata = {
             'scan_date': datetime.now().isoformat(),
             'input_folder': str(self.input_folder),
             'output_folder': str(self.output_folder),
-            'total_videos_scanned': len(results),
-            'slates_found': sum(1 for r in results if r['slate_found']),
-            'videos': results
+            'total_videos_scanned': total_videos,
+            'slates_found': len(results)
         }
         
         metadata_path = self.output_folder / 'slate_metadata.json'
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        with open(metadata_path, 'w', encoding='utf-8') as f, \
+             open(self.results_path, encoding='utf-8') as results_file:
+            f.write('{\n')
+            for key, value in metadata.items():
+                f.write(f'  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n')
+            
+            f.write('  "videos": [')
+            for i, line in enumerate(results_file):
+                f.write((',' if i else '') + '\n    ' + line.rstrip('\n'))
+            f.write('\n  ]\n}\n')
         
         logger.info(f"Metadata saved to {metadata_path}")
         
@@ -356,6 +751,13 @@ def main():
         action='store_true',
         help='Only save the first slate image per subfolder (all slates still registered in metadata)'
     )
+    parser.add_argument(
+        '--hwaccel',
+        default=None,
+        choices=hwdevices_available(),
+        help='Decode on the GPU with this device type, e.g. cuda or vaapi '
+             '(falls back to CPU decoding if unavailable)'
+    )
     
     args = parser.parse_args()
     
@@ -375,7 +777,8 @@ def main():
         args.frames,
         args.threshold,
         args.target_frame,
-        args.once
+        args.once,
+        args.hwaccel
     )
     
     # Find video files
@@ -392,7 +795,7 @@ def main():
     results = detector.process_videos_parallel(video_files, args.workers)
     
     # Save metadata
-    metadata = detector.save_metadata(results)
+    metadata = detector.save_metadata(results, len(video_files))
     
     # Print summary
     print("\n" + "="*50)